@@ -0,0 +1,176 @@
+"""
+Static asset pipeline for Scoresheet Halubilo
+Fingerprints static files for cache-busting, serves precompressed copies with
+immutable caching and compresses dynamic HTML/JSON responses.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import current_app, request, send_file, abort
+from werkzeug.security import safe_join
+
+# File types worth precompressing; images are already compressed
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.json', '.svg', '.html', '.txt', '.csv', '.xml'}
+DYNAMIC_MIMETYPES = {'text/html', 'application/json'}
+
+# (path) -> (mtime, size, fingerprint)
+_fingerprints = {}
+
+
+def fingerprint(filename):
+    """Return a short content hash for a file in the static folder, or None"""
+    path = safe_join(current_app.static_folder, filename)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    cached = _fingerprints.get(path)
+    if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        return cached[2]
+
+    # Not a security use; keeps fingerprinting working on FIPS-enabled hosts
+    digest = hashlib.md5(usedforsecurity=False)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    value = digest.hexdigest()[:12]
+    _fingerprints[path] = (stat.st_mtime, stat.st_size, value)
+    return value
+
+
+def _add_fingerprint(endpoint, values):
+    """url_defaults hook: append ?v=<hash> to every url_for('static', ...)"""
+    if endpoint != 'static' or 'v' in values or 'filename' not in values:
+        return
+    value = fingerprint(values['filename'])
+    if value:
+        values['v'] = value
+
+
+def _accepted_encodings():
+    """Return the content codings the client accepts, in server preference order"""
+    accepted = []
+    for encoding in ('br', 'gzip'):
+        if request.accept_encodings[encoding]:
+            accepted.append(encoding)
+    return accepted
+
+
+def serve_static(filename):
+    """Serve a static file, preferring a fresh precompressed copy when available"""
+    path = safe_join(current_app.static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    mimetype, encoding = mimetypes.guess_type(filename)
+    if encoding:
+        # Build output (a.css.gz) is only served through its source URL with Content-Encoding
+        if os.path.isfile(os.path.splitext(path)[0]):
+            abort(404)
+        # Other archives are served as-is, not as their inner type
+        mimetype = 'application/gzip' if encoding == 'gzip' else 'application/octet-stream'
+    mimetype = mimetype or 'application/octet-stream'
+    mtime = os.path.getmtime(path)
+    response = None
+
+    for encoding in _accepted_encodings():
+        compressed = path + ('.br' if encoding == 'br' else '.gz')
+        # Ignore stale precompressed files left over from an older build
+        if os.path.isfile(compressed) and os.path.getmtime(compressed) >= mtime:
+            response = send_file(compressed, mimetype=mimetype, conditional=True,
+                                 download_name=os.path.basename(path))
+            response.headers['Content-Encoding'] = encoding
+            break
+
+    if response is None:
+        response = send_file(path, mimetype=mimetype, conditional=True)
+
+    response.vary.add('Accept-Encoding')
+
+    # Fingerprinted URLs never change content, so they can be cached forever
+    version = request.args.get('v')
+    if version and version == fingerprint(filename):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config['STATIC_IMMUTABLE_MAX_AGE']
+        response.cache_control.immutable = True
+    return response
+
+
+def compress_response(response):
+    """after_request hook: gzip dynamic HTML/JSON responses"""
+    if (response.direct_passthrough
+            or response.status_code < 200 or response.status_code >= 300
+            or response.status_code == 204
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in DYNAMIC_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if not request.accept_encodings['gzip']:
+        return response
+
+    data = response.get_data()
+    if len(data) < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=current_app.config['COMPRESS_LEVEL']))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def build(static_folder, verbose=True):
+    """Write .gz (and .br when brotli is installed) copies next to compressible static files"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    built = 0
+    for root, _dirs, files in os.walk(static_folder):
+        for name in files:
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            outputs = [(path + '.gz', gzip.compress(data, compresslevel=9))]
+            if brotli is not None:
+                outputs.append((path + '.br', brotli.compress(data)))
+
+            for target, payload in outputs:
+                # Only keep the compressed copy if it actually saves bytes
+                if len(payload) >= len(data):
+                    if os.path.exists(target):
+                        os.remove(target)
+                    continue
+                with open(target, 'wb') as f:
+                    f.write(payload)
+                built += 1
+                if verbose:
+                    print(f"  {os.path.relpath(target, static_folder)} ({len(data)} -> {len(payload)} bytes)")
+    return built
+
+
+def init_app(app):
+    """Register the asset pipeline on a Flask app"""
+    app.config.setdefault('STATIC_IMMUTABLE_MAX_AGE', 365 * 24 * 3600)
+    app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+    app.config.setdefault('COMPRESS_LEVEL', 6)
+
+    app.url_defaults(_add_fingerprint)
+    app.view_functions['static'] = serve_static
+    app.after_request(compress_response)
+
+    @app.cli.command('build-assets')
+    def build_assets_command():
+        """Precompress static files (gzip, plus brotli if installed)."""
+        built = build(app.static_folder)
+        print(f"Built {built} precompressed static files")
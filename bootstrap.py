@@ -0,0 +1,94 @@
+"""
+One-time database bootstrap for Scoresheet Halubilo
+Creates missing tables, columns and indexes (including the unique index for
+the score uniqueness policy) and seeds the default admin user. Every
+step is idempotent, so it is safe to run from each worker as it starts.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+import scoring
+from extensions import db
+from models import User, StandingsVersion
+
+# Database URIs already bootstrapped by this process
+_bootstrapped = set()
+
+# Columns added after the first release: create_all() never alters existing tables
+ADDED_COLUMNS = {
+    'team': (
+        ('standings_version', 'INTEGER NOT NULL DEFAULT 0'),
+        ('standings_rank', 'INTEGER'),
+    ),
+}
+
+
+def add_missing_columns():
+    """Add columns that databases created by older releases are missing"""
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row[1] for row in db.session.execute(text(f'PRAGMA table_info({table})'))}
+        for name, ddl in columns:
+            if name in existing:
+                continue
+            try:
+                db.session.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}'))
+                db.session.commit()
+            except OperationalError:
+                # Another worker added the column first
+                db.session.rollback()
+
+
+def bootstrap_database(app, force=False):
+    """Create schema, indexes and the default admin user if they are missing"""
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if uri in _bootstrapped and not force:
+        return
+
+    with app.app_context():
+        try:
+            db.create_all()
+        except OperationalError:
+            # Another worker created the tables between our check and CREATE
+            db.session.rollback()
+
+        add_missing_columns()
+
+        # create_all() skips indexes on tables that already exist
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=db.engine, checkfirst=True)
+
+        # Unique index for the configured score uniqueness policy
+        scoring.ensure_unique_index(app)
+
+        # Seed the standings version counter used by leaderboard delta queries
+        if not StandingsVersion.query.get(1):
+            db.session.add(StandingsVersion(id=1, version=0))
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+
+        # Create default admin user if none exists
+        if not User.query.filter_by(role='admin').first():
+            admin = User(username='admin', email='admin@scoresheet.com', role='admin')
+            admin.set_password('admin123')
+            db.session.add(admin)
+            try:
+                db.session.commit()
+                print("Default admin user created: username='admin', password='admin123'")
+            except IntegrityError:
+                db.session.rollback()
+
+    _bootstrapped.add(uri)
+
+
+def init_app(app):
+    """Register the bootstrap CLI command"""
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create tables, indexes and the default admin user."""
+        bootstrap_database(app, force=True)
+        print("Database bootstrap completed")
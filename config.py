@@ -0,0 +1,36 @@
+"""
+Configuration for Scoresheet Halubilo
+Values can be overridden with environment variables (or a .env file).
+"""
+
+import os
+
+
+class Config:
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-here')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///scoresheet.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'static/uploads/teams')
+    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+
+    # Run schema/index creation and admin seeding when the app is created
+    BOOTSTRAP_ON_STARTUP = os.environ.get('BOOTSTRAP_ON_STARTUP', '1') == '1'
+    # Log a warning when create_app() takes longer than this (seconds)
+    STARTUP_BUDGET_SECONDS = float(os.environ.get('STARTUP_BUDGET_SECONDS', '1.0'))
+
+    # Serve public leaderboard reads from a periodically refreshed read-only copy
+    READ_SNAPSHOT_ENABLED = os.environ.get('READ_SNAPSHOT_ENABLED', '0') == '1'
+    READ_SNAPSHOT_PATH = os.environ.get('READ_SNAPSHOT_PATH')  # default: instance/scoresheet-snapshot.db
+    # Maximum age of the snapshot (seconds) before a public read refreshes it
+    READ_SNAPSHOT_MAX_STALENESS = float(os.environ.get('READ_SNAPSHOT_MAX_STALENESS', '5'))
+
+    # 'team_activity' (one score per team/activity) or 'team_activity_judge'
+    # (one per judge, averaged in standings); enforced by a unique index
+    SCORE_UNIQUENESS = os.environ.get('SCORE_UNIQUENESS', 'team_activity_judge')
+
+    # Directory to publish static leaderboard files into (disabled when unset)
+    PUBLISH_DIR = os.environ.get('PUBLISH_DIR')
+    # Public URL of the app, used for the login link on published pages (hidden when unset)
+    PUBLISH_BASE_URL = os.environ.get('PUBLISH_BASE_URL')
+    # Delay before publishing after a standings change; changes in the window share one publish
+    PUBLISH_DEBOUNCE_SECONDS = float(os.environ.get('PUBLISH_DEBOUNCE_SECONDS', '2'))
@@ -0,0 +1,71 @@
+"""
+Set-based cascading deletes for Scoresheet Halubilo
+Dependent rows are removed or detached with one statement per table instead
+of being loaded through the ORM, mirroring the ON DELETE rules on the models.
+"""
+
+import os
+
+from flask import current_app
+
+from extensions import db
+from models import User, Team, Activity, Score
+from standings import mark_changed as mark_standings_changed
+
+
+def delete_teams(team_ids):
+    """Delete teams and all their scores; return (teams deleted, image filenames)"""
+    team_ids = list(set(team_ids))
+    if not team_ids:
+        return 0, []
+
+    filenames = [filename for (filename,) in
+                 db.session.query(Team.image_filename)
+                 .filter(Team.id.in_(team_ids), Team.image_filename.isnot(None))]
+    Score.query.filter(Score.team_id.in_(team_ids)).delete(synchronize_session=False)
+    deleted = Team.query.filter(Team.id.in_(team_ids)).delete(synchronize_session=False)
+    # Removed teams drop out of the ranked ids returned to delta clients
+    mark_standings_changed()
+    db.session.expire_all()
+    return deleted, filenames
+
+
+def delete_activities(activity_ids):
+    """Delete activities and their scores and unassign their judges; return activities deleted"""
+    activity_ids = list(set(activity_ids))
+    if not activity_ids:
+        return 0
+
+    affected_team_ids = [team_id for (team_id,) in
+                         db.session.query(Score.team_id).filter(Score.activity_id.in_(activity_ids)).distinct()]
+    Score.query.filter(Score.activity_id.in_(activity_ids)).delete(synchronize_session=False)
+    User.query.filter(User.activity_id.in_(activity_ids)).update({User.activity_id: None},
+                                                                 synchronize_session=False)
+    deleted = Activity.query.filter(Activity.id.in_(activity_ids)).delete(synchronize_session=False)
+    mark_standings_changed(affected_team_ids)
+    db.session.expire_all()
+    return deleted
+
+
+def delete_users(user_ids):
+    """Delete users, keeping their scores but clearing the author; return users deleted"""
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return 0
+
+    Score.query.filter(Score.created_by.in_(user_ids)).update({Score.created_by: None},
+                                                              synchronize_session=False)
+    deleted = User.query.filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+    db.session.expire_all()
+    return deleted
+
+
+def remove_team_images(filenames):
+    """Remove uploaded team images; call after the delete has been committed"""
+    for filename in filenames:
+        try:
+            filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+            if os.path.exists(filepath):
+                os.remove(filepath)
+        except OSError:
+            pass  # Ignore if file not found
@@ -64,14 +64,12 @@ def main():
     # Test the application
     print("\n🧪 Testing application...")
     try:
-        from app import app
+        from app import create_app
+        # create_app() also creates tables, indexes and the default admin
+        app = create_app()
         print("✅ Application imports successfully")
-        
-        # Test database connection
-        with app.app_context():
-            from app import db
-            db.create_all()
-            print("✅ Database setup successful")
+        print("✅ Database setup successful")
+        print(f"⏱️  Cold start: {app.config['STARTUP_SECONDS']:.3f}s")
             
     except Exception as e:
         print(f"❌ Application test failed: {e}")
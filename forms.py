@@ -0,0 +1,51 @@
+"""
+WTForms definitions for Scoresheet Halubilo
+"""
+
+from flask_wtf import FlaskForm
+from flask_wtf.file import FileField, FileAllowed
+from wtforms import StringField, TextAreaField, IntegerField, SelectField, SubmitField, PasswordField
+from wtforms.validators import DataRequired, Email, Length, NumberRange
+
+class LoginForm(FlaskForm):
+    username = StringField('Username', validators=[DataRequired()])
+    password = PasswordField('Password', validators=[DataRequired()])
+    submit = SubmitField('Sign In')
+
+class RegistrationForm(FlaskForm):
+    username = StringField('Username', validators=[DataRequired(), Length(min=3, max=20)])
+    email = StringField('Email', validators=[DataRequired(), Email()])
+    password = PasswordField('Password', validators=[DataRequired(), Length(min=6)])
+    confirm_password = PasswordField('Confirm Password', validators=[DataRequired()])
+    submit = SubmitField('Register')
+
+class TeamForm(FlaskForm):
+    name = StringField('Team Name')
+    image = FileField('Team Image', validators=[
+        FileAllowed(['jpg', 'jpeg', 'png', 'gif'], 'Only image files are allowed!')
+    ])
+    csv_file = FileField('Bulk Upload CSV', validators=[
+        FileAllowed(['csv'], 'Only CSV files are allowed!')
+    ])
+    submit = SubmitField('Add Individual Team')
+    bulk_submit = SubmitField('Upload CSV')
+
+class ActivityForm(FlaskForm):
+    name = StringField('Activity Name', validators=[DataRequired()])
+    description = TextAreaField('Description')
+    max_score = IntegerField('Maximum Score', validators=[DataRequired(), NumberRange(min=1, max=1000)])
+    submit = SubmitField('Add Activity')
+
+class QuickUserForm(FlaskForm):
+    username = StringField('Username', validators=[DataRequired(), Length(min=3, max=20)])
+    email = StringField('Email', validators=[DataRequired(), Email()])
+    password = StringField('Password', validators=[DataRequired(), Length(min=6)])
+    activity_id = SelectField('Assign to Activity', coerce=int, validators=[DataRequired()])
+    submit = SubmitField('Create User for Activity')
+
+class ScoreForm(FlaskForm):
+    team_id = SelectField('Team', coerce=int, validators=[DataRequired()])
+    activity_id = SelectField('Activity', coerce=int, validators=[DataRequired()])
+    score = IntegerField('Score', validators=[DataRequired(), NumberRange(min=0)])
+    notes = TextAreaField('Notes')
+    submit = SubmitField('Submit Score')
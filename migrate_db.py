@@ -2,15 +2,54 @@
 """
 Database Migration Script for Scoresheet Halubilo
 Adds activity_id field to User model for activity-based user assignments
+rebuilds the score table with ON DELETE rules for its foreign keys and adds
+the standings_version/standings_rank fields to Team for leaderboard delta queries
 """
 
 import sqlite3
 import os
 
+def migrate_score_foreign_keys(cursor):
+    """Rebuild the score table so deleting a team/activity cascades and deleting a user keeps the score"""
+    cursor.execute("PRAGMA foreign_key_list(score)")
+    on_delete = {row[3]: row[6] for row in cursor.fetchall()}  # from column -> on_delete
+    if on_delete.get('team_id') == 'CASCADE' and on_delete.get('created_by') == 'SET NULL':
+        print("✅ score foreign keys already have ON DELETE rules")
+        return
+    
+    print("Rebuilding score table with ON DELETE rules...")
+    cursor.execute("""
+        CREATE TABLE score_new (
+            id INTEGER NOT NULL PRIMARY KEY,
+            team_id INTEGER NOT NULL REFERENCES team(id) ON DELETE CASCADE,
+            activity_id INTEGER NOT NULL REFERENCES activity(id) ON DELETE CASCADE,
+            score INTEGER NOT NULL,
+            notes TEXT,
+            created_by INTEGER REFERENCES user(id) ON DELETE SET NULL,
+            created_at DATETIME
+        )
+    """)
+    # Drop scores orphaned by earlier team/activity deletes; they corrupt totals
+    cursor.execute("""
+        INSERT INTO score_new (id, team_id, activity_id, score, notes, created_by, created_at)
+        SELECT id, team_id, activity_id, score, notes, created_by, created_at FROM score
+        WHERE team_id IN (SELECT id FROM team) AND activity_id IN (SELECT id FROM activity)
+    """)
+    orphaned = cursor.execute("SELECT (SELECT COUNT(*) FROM score) - (SELECT COUNT(*) FROM score_new)").fetchone()[0]
+    cursor.execute("UPDATE score_new SET created_by = NULL WHERE created_by NOT IN (SELECT id FROM user)")
+    cursor.execute("DROP TABLE score")
+    cursor.execute("ALTER TABLE score_new RENAME TO score")
+    for column in ('team_id', 'activity_id', 'created_by'):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS ix_score_{column} ON score ({column})")
+    print(f"✅ Rebuilt score table (removed {orphaned} orphaned scores)")
+
 def migrate_database():
     """Migrate the database to add activity_id field to users table"""
     
+    # Flask-SQLAlchemy 3 keeps relative SQLite databases in the instance folder
     db_path = 'scoresheet.db'
+    if not os.path.exists(db_path) and os.path.exists(os.path.join('instance', db_path)):
+        db_path = os.path.join('instance', db_path)
     
     if not os.path.exists(db_path):
         print("Database not found. Please run the main application first to create it.")
@@ -31,6 +70,25 @@ def migrate_database():
         else:
             print("✅ activity_id column already exists")
         
+        migrate_score_foreign_keys(cursor)
+        
+        cursor.execute("PRAGMA table_info(team)")
+        columns = [column[1] for column in cursor.fetchall()]
+        
+        if 'standings_version' not in columns:
+            print("Adding standings_version column to team table...")
+            cursor.execute("ALTER TABLE team ADD COLUMN standings_version INTEGER NOT NULL DEFAULT 0")
+            print("✅ Successfully added standings_version column")
+        else:
+            print("✅ standings_version column already exists")
+        
+        if 'standings_rank' not in columns:
+            print("Adding standings_rank column to team table...")
+            cursor.execute("ALTER TABLE team ADD COLUMN standings_rank INTEGER")
+            print("✅ Successfully added standings_rank column")
+        else:
+            print("✅ standings_rank column already exists")
+        
         # Commit changes
         conn.commit()
         print("Database migration completed successfully!")
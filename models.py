@@ -0,0 +1,66 @@
+"""
+Database models for Scoresheet Halubilo
+"""
+
+from datetime import datetime
+
+from flask_login import UserMixin
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from extensions import db, login_manager
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    return User.query.get(int(user_id))
+
+class User(UserMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(120), nullable=False)
+    role = db.Column(db.String(20), default='user')  # 'admin' or 'user'
+    activity_id = db.Column(db.Integer, db.ForeignKey('activity.id', ondelete='SET NULL'), nullable=True, index=True)  # Assign to specific activity
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationship to activity
+    activity = db.relationship('Activity', backref='assigned_users')
+
+    def set_password(self, password):
+        self.password_hash = generate_password_hash(password)
+
+    def check_password(self, password):
+        return check_password_hash(self.password_hash, password)
+
+class Team(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    image_filename = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # StandingsVersion.version of the last change to this team's standing
+    standings_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Rank at standings_version; a rank change also stamps a new version
+    standings_rank = db.Column(db.Integer, nullable=True)
+    scores = db.relationship('Score', backref='team', lazy=True, passive_deletes=True)
+
+class Activity(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    max_score = db.Column(db.Integer, default=100)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    scores = db.relationship('Score', backref='activity', lazy=True, passive_deletes=True)
+
+class Score(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    team_id = db.Column(db.Integer, db.ForeignKey('team.id', ondelete='CASCADE'), nullable=False, index=True)
+    activity_id = db.Column(db.Integer, db.ForeignKey('activity.id', ondelete='CASCADE'), nullable=False, index=True)
+    score = db.Column(db.Integer, nullable=False)
+    notes = db.Column(db.Text)
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'), nullable=True, index=True)  # NULL once the judge is deleted
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class StandingsVersion(db.Model):
+    """Single-row counter bumped whenever any team's standing changes"""
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,156 @@
+"""
+Static standings publisher for Scoresheet Halubilo
+Renders the public leaderboard to static files (leaderboard.json and
+index.html, plus .gz copies) in PUBLISH_DIR so any static file server can
+serve spectators without touching the app. Files are written atomically.
+The published page is self-contained: team images are copied next to it and
+links back into the app are made absolute with PUBLISH_BASE_URL.
+Publishing runs shortly after each commit that bumps the standings version
+(debounced by PUBLISH_DEBOUNCE_SECONDS) or on an interval via
+'flask publish-standings'. Anything the page shows, including activity
+names and counts, must call standings.mark_changed() to be republished.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import click
+from flask import current_app, render_template
+from sqlalchemy import event
+
+from extensions import db
+from standings import DEFAULT_LEADERBOARD_FIELDS, current_version, leaderboard_context
+
+_timer_lock = threading.Lock()
+_timer = None
+
+
+def _write_atomic(directory, name, data):
+    """Write bytes to directory/name (and a .gz copy) via rename, so readers never see partial files"""
+    for filename, payload in ((name, data), (name + '.gz', gzip.compress(data, compresslevel=9))):
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=f'.{filename}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, os.path.join(directory, filename))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+def _copy_team_images(app, directory, filenames):
+    """Copy team images into directory/uploads/teams; stored names are timestamped, so existing copies are current"""
+    target_dir = os.path.join(directory, 'uploads', 'teams')
+    os.makedirs(target_dir, exist_ok=True)
+    for filename in filenames:
+        source = os.path.join(app.static_folder, 'uploads', 'teams', filename)
+        target = os.path.join(target_dir, filename)
+        if os.path.exists(target) or not os.path.isfile(source):
+            continue
+        fd, tmp = tempfile.mkstemp(dir=target_dir, prefix=f'.{filename}.', suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(source, tmp)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+def publish(app=None):
+    """Render the leaderboard JSON and HTML into PUBLISH_DIR; return the version published"""
+    app = app or current_app._get_current_object()
+    directory = app.config['PUBLISH_DIR']
+    os.makedirs(directory, exist_ok=True)
+
+    # A request context with no logged-in user renders the public page;
+    # external URLs (the login link) point at PUBLISH_BASE_URL
+    with app.test_request_context('/', base_url=app.config['PUBLISH_BASE_URL']):
+        context = leaderboard_context()
+        version = current_version()
+        leaderboard = [{field: team[field] for field in DEFAULT_LEADERBOARD_FIELDS}
+                       for team in context['teams']]
+        images = {team['image_filename'] for team in context['teams'] if team['image_filename']}
+        images.update(score.team.image_filename for score in context['recent_scores']
+                      if score.team.image_filename)
+        html = render_template('index.html', published=True,
+                               app_url=app.config['PUBLISH_BASE_URL'], **context)
+
+    _copy_team_images(app, directory, images)
+    _write_atomic(directory, 'leaderboard.json', json.dumps(leaderboard).encode('utf-8'))
+    _write_atomic(directory, 'index.html', html.encode('utf-8'))
+    # Written last: clients polling the version only see it once the data is in place
+    _write_atomic(directory, 'version.json', json.dumps({'version': version}).encode('utf-8'))
+    return version
+
+
+def _publish_later(app):
+    global _timer
+    with _timer_lock:
+        _timer = None
+    try:
+        with app.app_context():
+            publish(app)
+    except Exception:
+        app.logger.exception('Publishing static standings failed')
+
+
+def schedule(app=None):
+    """Publish after PUBLISH_DEBOUNCE_SECONDS; changes made meanwhile share that publish"""
+    global _timer
+    app = app or current_app._get_current_object()
+    with _timer_lock:
+        if _timer is not None:
+            return
+        _timer = threading.Timer(app.config['PUBLISH_DEBOUNCE_SECONDS'], _publish_later, args=(app,))
+        _timer.daemon = True
+        _timer.start()
+
+
+def _after_commit(session):
+    if session.info.pop('standings_changed', False) and current_app.config.get('PUBLISH_DIR'):
+        schedule()
+
+
+def _after_rollback(session):
+    session.info.pop('standings_changed', None)
+
+
+def init_app(app):
+    """Publish on standings commits when PUBLISH_DIR is set, and register the CLI command"""
+    app.config.setdefault('PUBLISH_DIR', None)
+    app.config.setdefault('PUBLISH_BASE_URL', None)
+    app.config.setdefault('PUBLISH_DEBOUNCE_SECONDS', 2.0)
+
+    if not event.contains(db.session, 'after_commit', _after_commit):
+        event.listen(db.session, 'after_commit', _after_commit)
+        event.listen(db.session, 'after_rollback', _after_rollback)
+
+    @app.cli.command('publish-standings')
+    @click.option('--interval', type=float, default=0,
+                  help='Republish every N seconds when the standings version changes (0 = once).')
+    def publish_standings_command(interval):
+        """Render the leaderboard to static files in PUBLISH_DIR."""
+        if not app.config['PUBLISH_DIR']:
+            raise click.UsageError('Set PUBLISH_DIR to the directory to publish into.')
+
+        published = None
+        while True:
+            with app.app_context():
+                version = current_version()
+                if version != published:
+                    published = publish(app)
+                    print(f"Published standings version {published} to {app.config['PUBLISH_DIR']}")
+                db.session.remove()
+            if not interval:
+                break
+            time.sleep(interval)
@@ -0,0 +1,815 @@
+"""
+Routes for Scoresheet Halubilo
+"""
+
+from datetime import datetime
+import os
+import csv
+import io
+
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, jsonify, abort
+from flask_login import login_user, login_required, logout_user, current_user
+from flask_wtf.csrf import generate_csrf, validate_csrf
+from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import secure_filename
+from wtforms.validators import ValidationError
+
+import snapshot
+from deletes import delete_teams, delete_activities, delete_users, remove_team_images
+from extensions import db
+from models import User, Team, Activity, Score
+from forms import LoginForm, RegistrationForm, TeamForm, ActivityForm, QuickUserForm, ScoreForm
+from scoring import ensure_unique_index, find_duplicates, find_score, per_judge, unique_index_exists, upsert_score
+from standings import compute_standings, current_version, leaderboard_context
+from standings import mark_changed as mark_standings_changed
+from standings import LEADERBOARD_FIELDS, DEFAULT_LEADERBOARD_FIELDS
+
+bp = Blueprint('main', __name__)
+
+def save_team_image(file_storage):
+    """Save an uploaded team image and return its stored filename"""
+    filename = secure_filename(file_storage.filename)
+    # Add timestamp to prevent filename conflicts
+    name, ext = os.path.splitext(filename)
+    filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}"
+    # Created on first upload rather than at import time
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    os.makedirs(upload_folder, exist_ok=True)
+    file_storage.save(os.path.join(upload_folder, filename))
+    return filename
+
+def csrf_token_valid(token):
+    """Check the CSRF token sent with a POST that is not backed by a FlaskForm"""
+    if not current_app.config.get('WTF_CSRF_ENABLED', True):
+        return True
+    try:
+        validate_csrf(token)
+    except ValidationError:
+        return False
+    return True
+
+# Decorator for admin-only routes
+def admin_required(f):
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated or current_user.role != 'admin':
+            abort(403)
+        return f(*args, **kwargs)
+    decorated_function.__name__ = f.__name__
+    return decorated_function
+
+@bp.route('/')
+def index():
+    if current_user.is_authenticated:
+        if current_user.role == 'admin':
+            return redirect(url_for('main.admin_dashboard'))
+        else:
+            return redirect(url_for('main.user_dashboard'))
+    
+    # Public page: read from the snapshot when enabled
+    return render_template('index.html', **leaderboard_context(snapshot.read_session()))
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if current_user.is_authenticated:
+        return redirect(url_for('main.index'))
+    
+    form = LoginForm()
+    if form.validate_on_submit():
+        user = User.query.filter_by(username=form.username.data).first()
+        if user and user.check_password(form.password.data):
+            login_user(user)
+            next_page = request.args.get('next')
+            if not next_page or not next_page.startswith('/'):
+                next_page = url_for('main.index')
+            return redirect(next_page)
+        else:
+            flash('Invalid username or password', 'error')
+    
+    return render_template('login.html', form=form)
+
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    if current_user.is_authenticated:
+        return redirect(url_for('main.index'))
+    
+    form = RegistrationForm()
+    if form.validate_on_submit():
+        if form.password.data != form.confirm_password.data:
+            flash('Passwords do not match', 'error')
+            return render_template('register.html', form=form)
+        
+        if User.query.filter_by(username=form.username.data).first():
+            flash('Username already exists', 'error')
+            return render_template('register.html', form=form)
+        
+        if User.query.filter_by(email=form.email.data).first():
+            flash('Email already registered', 'error')
+            return render_template('register.html', form=form)
+        
+        user = User(username=form.username.data, email=form.email.data)
+        user.set_password(form.password.data)
+        db.session.add(user)
+        db.session.commit()
+        
+        flash('Registration successful! Please log in.', 'success')
+        return redirect(url_for('main.login'))
+    
+    return render_template('register.html', form=form)
+
+@bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    return redirect(url_for('main.index'))
+
+@bp.route('/admin/dashboard')
+@login_required
+@admin_required
+def admin_dashboard():
+    teams = Team.query.all()
+    activities = Activity.query.all()
+    users = User.query.all()
+    
+    # Calculate statistics in one aggregate query
+    team_stats = compute_standings()
+    
+    return render_template('admin_dashboard.html', 
+                         team_stats=team_stats,
+                         activities=activities,
+                         users=users,
+                         teams=teams)
+
+@bp.route('/user/dashboard')
+@login_required
+def user_dashboard():
+    activities = Activity.query.all()
+    user_scores = Score.query.filter_by(created_by=current_user.id).order_by(Score.created_at.desc()).all()
+    
+    # Standings sorted by total score (descending)
+    teams = compute_standings()
+    
+    return render_template('user_dashboard.html', 
+                         teams=teams,
+                         activities=activities,
+                         user_scores=user_scores)
+
+@bp.route('/teams', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def teams():
+    form = TeamForm()
+    if form.validate_on_submit():
+        # Check if any input method is provided
+        has_csv = form.csv_file.data and form.csv_file.data.filename
+        has_individual = form.name.data and form.name.data.strip()
+        
+        if not has_csv and not has_individual:
+            flash('Please provide a team name for individual creation or upload a CSV file.', 'warning')
+            return redirect(url_for('main.teams'))
+        
+        if form.csv_file.data:
+            # Handle CSV upload
+            csv_file = form.csv_file.data
+            if csv_file.filename.endswith('.csv'):
+                try:
+                    # Read the uploaded CSV file
+                    file_content = csv_file.read()
+                    # Use io.StringIO to read the file content as a string
+                    file_stream = io.StringIO(file_content.decode('utf-8'))
+                    csv_reader = csv.DictReader(file_stream)
+
+                    new_teams = []
+                    teams_created = 0
+                    teams_skipped = 0
+
+                    # Process each row in the CSV
+                    for row in csv_reader:
+                        team_name = row.get('Team Name', '').strip()
+                        if not team_name:
+                            continue  # Skip empty rows
+                        
+                        # Check if team already exists
+                        existing_team = Team.query.filter_by(name=team_name).first()
+                        if existing_team:
+                            teams_skipped += 1
+                            continue
+
+                        team = Team(name=team_name)
+                        db.session.add(team)
+                        new_teams.append(team)
+                        teams_created += 1
+                    
+                    if new_teams:
+                        db.session.flush()
+                        mark_standings_changed([team.id for team in new_teams])
+                    db.session.commit()
+                    
+                    if teams_created > 0:
+                        flash(f'Successfully created {teams_created} teams from CSV!', 'success')
+                    if teams_skipped > 0:
+                        flash(f'Skipped {teams_skipped} existing teams.', 'warning')
+                    if teams_created == 0 and teams_skipped == 0:
+                        flash('No valid teams found in CSV file.', 'warning')
+                        
+                except csv.Error as e:
+                    flash(f'Error reading CSV file: {e}', 'error')
+                except Exception as e:
+                    flash(f'An unexpected error occurred: {e}', 'error')
+                    db.session.rollback()
+            else:
+                flash('Please select a valid CSV file.', 'error')
+        elif form.name.data and form.name.data.strip():  # Only create individual team if name is provided
+            # Handle individual team creation
+            if form.image.data:
+                # Handle individual team creation with image
+                filename = save_team_image(form.image.data)
+                team = Team(name=form.name.data.strip(), image_filename=filename)
+                db.session.add(team)
+                db.session.flush()
+                mark_standings_changed([team.id])
+                db.session.commit()
+                flash('Team added successfully!', 'success')
+            else:
+                # Handle individual team creation without image
+                team = Team(name=form.name.data.strip())
+                db.session.add(team)
+                db.session.flush()
+                mark_standings_changed([team.id])
+                db.session.commit()
+                flash('Team added successfully!', 'success')
+        
+        return redirect(url_for('main.teams'))
+    
+    teams = Team.query.all()
+    standings = {team['id']: team for team in compute_standings()}
+    return render_template('teams.html', form=form, teams=teams, standings=standings,
+                           csrf_token=generate_csrf())
+
+@bp.route('/teams/<int:team_id>/edit', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def edit_team(team_id):
+    team = Team.query.get_or_404(team_id)
+    form = TeamForm(obj=team)
+    
+    if form.validate_on_submit():
+        # Handle file upload
+        if form.image.data:
+            # Delete old image if it exists
+            if team.image_filename:
+                try:
+                    old_filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], team.image_filename)
+                    if os.path.exists(old_filepath):
+                        os.remove(old_filepath)
+                except OSError:
+                    pass  # Ignore if file not found
+            
+            # Save new image
+            filename = save_team_image(form.image.data)
+            team.image_filename = filename
+        
+        team.name = form.name.data
+        mark_standings_changed([team.id])
+        db.session.commit()
+        flash('Team updated successfully!', 'success')
+        return redirect(url_for('main.teams'))
+    
+    return render_template('edit_team.html', form=form, team=team)
+
+@bp.route('/teams/<int:team_id>/delete')
+@login_required
+@admin_required
+def delete_team(team_id):
+    team = Team.query.get_or_404(team_id)
+    # Scores are removed in one statement rather than loaded through the ORM
+    deleted, filenames = delete_teams([team.id])
+    db.session.commit()
+    remove_team_images(filenames)
+    snapshot.invalidate()
+    flash('Team deleted successfully!', 'success')
+    return redirect(url_for('main.teams'))
+
+@bp.route('/teams/bulk-delete', methods=['POST'])
+@login_required
+@admin_required
+def bulk_delete_teams():
+    """Delete the selected teams with all their scores and images"""
+    if not csrf_token_valid(request.form.get('csrf_token')):
+        flash('Your session expired. Please try again.', 'error')
+        return redirect(url_for('main.teams'))
+    
+    team_ids = request.form.getlist('team_ids', type=int)
+    if not team_ids:
+        flash('Select at least one team to delete.', 'warning')
+        return redirect(url_for('main.teams'))
+    
+    try:
+        deleted, filenames = delete_teams(team_ids)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        flash('Error deleting teams. Please try again.', 'error')
+        return redirect(url_for('main.teams'))
+    
+    remove_team_images(filenames)
+    snapshot.invalidate()
+    flash(f'Deleted {deleted} teams and their scores.', 'success')
+    return redirect(url_for('main.teams'))
+
+@bp.route('/activities', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def activities():
+    form = ActivityForm()
+    user_form = QuickUserForm()
+    
+    # Populate activity choices for user form
+    user_form.activity_id.choices = [(activity.id, activity.name) for activity in Activity.query.all()]
+    
+    if form.validate_on_submit():
+        activity = Activity(
+            name=form.name.data,
+            description=form.description.data,
+            max_score=form.max_score.data
+        )
+        db.session.add(activity)
+        # The public leaderboard shows the activity count, so republish it
+        mark_standings_changed()
+        db.session.commit()
+        flash('Activity added successfully!', 'success')
+        return redirect(url_for('main.activities'))
+    
+    if user_form.validate_on_submit():
+        # Check if username or email already exists
+        if User.query.filter_by(username=user_form.username.data).first():
+            flash('Username already exists', 'error')
+        elif User.query.filter_by(email=user_form.email.data).first():
+            flash('Email already registered', 'error')
+        else:
+            # Create new user assigned to specific activity
+            user = User(
+                username=user_form.username.data,
+                email=user_form.email.data,
+                role='user',  # Default role for quick-created users
+                activity_id=user_form.activity_id.data  # Assign to selected activity
+            )
+            user.set_password(user_form.password.data)
+            db.session.add(user)
+            db.session.commit()
+            
+            flash(f'User {user.username} created successfully for activity!', 'success')
+            return redirect(url_for('main.activities'))
+    
+    activities = Activity.query.all()
+    return render_template('activities.html', form=form, user_form=user_form, activities=activities)
+
+@bp.route('/activities/<int:activity_id>/edit', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def edit_activity(activity_id):
+    activity = Activity.query.get_or_404(activity_id)
+    form = ActivityForm(obj=activity)
+    
+    if form.validate_on_submit():
+        activity.name = form.name.data
+        activity.description = form.description.data
+        activity.max_score = form.max_score.data
+        # Recent scores on the public leaderboard show activity names
+        mark_standings_changed()
+        db.session.commit()
+        flash('Activity updated successfully!', 'success')
+        return redirect(url_for('main.activities'))
+    
+    return render_template('edit_activity.html', form=form, activity=activity)
+
+@bp.route('/activities/<int:activity_id>/delete')
+@login_required
+@admin_required
+def delete_activity(activity_id):
+    activity = Activity.query.get_or_404(activity_id)
+    delete_activities([activity.id])
+    db.session.commit()
+    snapshot.invalidate()
+    flash('Activity deleted successfully!', 'success')
+    return redirect(url_for('main.activities'))
+
+@bp.route('/scores', methods=['GET', 'POST'])
+@login_required
+def scores():
+    form = ScoreForm()
+    form.team_id.choices = [(team.id, team.name) for team in Team.query.all()]
+    # Lock activity to assigned activity for non-admin users
+    if current_user.role != 'admin' and getattr(current_user, 'activity_id', None):
+        assigned_activity = Activity.query.get(current_user.activity_id)
+        form.activity_id.choices = [(assigned_activity.id, assigned_activity.name)]
+        # Ensure the correct value is set on both GET and POST
+        form.activity_id.data = assigned_activity.id
+    else:
+        form.activity_id.choices = [(activity.id, activity.name) for activity in Activity.query.all()]
+    
+    if form.validate_on_submit():
+        # Enforce activity lock serverside as well
+        activity_id = form.activity_id.data
+        if current_user.role != 'admin' and getattr(current_user, 'activity_id', None):
+            activity_id = current_user.activity_id
+        # One score per key (see SCORE_UNIQUENESS): resubmitting updates it
+        for attempt in range(2):
+            score, created = upsert_score(form.team_id.data, activity_id, form.score.data,
+                                          current_user.id, notes=form.notes.data)
+            mark_standings_changed([score.team_id])
+            try:
+                db.session.commit()
+                break
+            except IntegrityError:
+                # A concurrent submission stored the same key first; update that one
+                db.session.rollback()
+        else:
+            flash('Could not save the score. Please try again.', 'error')
+            return redirect(url_for('main.scores'))
+        if created:
+            flash('Score submitted successfully!', 'success')
+        else:
+            flash('Existing score for this team and activity updated.', 'success')
+        return redirect(url_for('main.scores'))
+    
+    scores = Score.query.order_by(Score.created_at.desc()).all()
+
+    # Build current standings: total score per team, sorted desc
+    teams = compute_standings()
+
+    return render_template('scores.html', form=form, scores=scores, teams=teams)
+
+def _sheet_activity_allowed(activity_id):
+    """Judges locked to an activity may only use that activity's sheet"""
+    if current_user.role != 'admin' and getattr(current_user, 'activity_id', None):
+        return current_user.activity_id == activity_id
+    return True
+
+@bp.route('/scores/sheet')
+@login_required
+def score_sheet_index():
+    """Send judges to their assigned activity's sheet; others pick an activity"""
+    if current_user.role != 'admin' and getattr(current_user, 'activity_id', None):
+        return redirect(url_for('main.score_sheet', activity_id=current_user.activity_id))
+    
+    activities = Activity.query.order_by(Activity.name).all()
+    if len(activities) == 1:
+        return redirect(url_for('main.score_sheet', activity_id=activities[0].id))
+    return render_template('score_sheet.html', activity=None, activities=activities, rows=[])
+
+@bp.route('/scores/sheet/<int:activity_id>')
+@login_required
+def score_sheet(activity_id):
+    """Team-by-activity scoring sheet: every team as a row with the judge's own score"""
+    activity = Activity.query.get_or_404(activity_id)
+    if not _sheet_activity_allowed(activity.id):
+        abort(403)
+    
+    # One query: every team, outer-joined with all of its scores for this activity
+    results = (db.session.query(Team.id, Team.name, Team.image_filename,
+                                Score.id, Score.score, Score.created_by)
+               .outerjoin(Score, and_(Score.team_id == Team.id, Score.activity_id == activity.id))
+               .order_by(Team.name, Score.id)
+               .all())
+    
+    rows = {}
+    for team_id, name, image_filename, score_id, value, created_by in results:
+        row = rows.setdefault(team_id, {'id': team_id, 'name': name, 'image_filename': image_filename,
+                                        'score': None, 'score_count': 0})
+        if score_id is None:
+            continue
+        row['score_count'] += 1
+        if created_by == current_user.id or not per_judge():
+            row['score'] = value
+    
+    activities = Activity.query.order_by(Activity.name).all() if current_user.role == 'admin' else [activity]
+    return render_template('score_sheet.html', activity=activity, activities=activities, rows=list(rows.values()),
+                           csrf_token=generate_csrf())
+
+@bp.route('/scores/sheet/<int:activity_id>', methods=['POST'])
+@login_required
+def save_score_sheet(activity_id):
+    """Apply a batched diff {"scores": {team_id: score or null}} to the judge's scores"""
+    activity = Activity.query.get_or_404(activity_id)
+    if not _sheet_activity_allowed(activity.id):
+        abort(403)
+    
+    if not csrf_token_valid(request.headers.get('X-CSRFToken')):
+        return jsonify({'error': 'Invalid or missing CSRF token'}), 400
+    
+    payload = request.get_json(silent=True) or {}
+    diff = payload.get('scores')
+    if not isinstance(diff, dict):
+        return jsonify({'error': 'Expected {"scores": {team_id: score or null}}'}), 400
+    
+    changes = {}
+    errors = {}
+    for key, value in diff.items():
+        try:
+            team_id = int(key)
+        except (TypeError, ValueError):
+            errors[str(key)] = 'Invalid team id'
+            continue
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int)
+                                  or value < 0 or value > activity.max_score):
+            errors[str(team_id)] = f'Score must be a whole number from 0 to {activity.max_score}'
+            continue
+        changes[team_id] = value
+    if errors:
+        return jsonify({'error': 'Some scores are invalid', 'errors': errors}), 400
+    
+    team_ids = set(changes)
+    known_ids = {team_id for (team_id,) in db.session.query(Team.id).filter(Team.id.in_(team_ids))}
+    unknown = team_ids - known_ids
+    if unknown:
+        return jsonify({'error': 'Unknown teams', 'errors': {str(t): 'Unknown team' for t in unknown}}), 400
+    
+    # Existing scores for the submitted teams under the uniqueness policy, in one query
+    query = Score.query.filter(Score.activity_id == activity.id, Score.team_id.in_(team_ids))
+    if per_judge():
+        query = query.filter(Score.created_by == current_user.id)
+    existing = {score.team_id: score for score in query}
+    
+    # Clearing a cell deletes the score: only its judge or an admin may do that
+    if current_user.role != 'admin':
+        forbidden = {str(team_id): "Only an admin can clear another judge's score"
+                     for team_id, value in changes.items()
+                     if value is None and team_id in existing
+                     and existing[team_id].created_by != current_user.id}
+        if forbidden:
+            return jsonify({'error': 'Some scores cannot be cleared', 'errors': forbidden}), 403
+    
+    saved = deleted = 0
+    changed_team_ids = []
+    for team_id, value in changes.items():
+        score = existing.get(team_id)
+        if value is None:
+            if score is not None:
+                db.session.delete(score)
+                deleted += 1
+                changed_team_ids.append(team_id)
+        elif score is None:
+            db.session.add(Score(team_id=team_id, activity_id=activity.id, score=value,
+                                 created_by=current_user.id))
+            saved += 1
+            changed_team_ids.append(team_id)
+        elif score.score != value:
+            score.score = value
+            score.created_by = current_user.id
+            saved += 1
+            changed_team_ids.append(team_id)
+    
+    if changed_team_ids:
+        mark_standings_changed(changed_team_ids)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'error': 'Another judge saved some of these scores at the same time; '
+                                     'reload the sheet and try again'}), 409
+    return jsonify({'saved': saved, 'deleted': deleted})
+
+@bp.route('/scores/<int:score_id>/edit', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def edit_score(score_id):
+    score = Score.query.get_or_404(score_id)
+    
+    # Users can only edit their own scores, admins can edit any
+    if current_user.role != 'admin' and score.created_by != current_user.id:
+        abort(403)
+    
+    form = ScoreForm(obj=score)
+    form.team_id.choices = [(team.id, team.name) for team in Team.query.all()]
+    if current_user.role != 'admin' and getattr(current_user, 'activity_id', None):
+        assigned_activity = Activity.query.get(current_user.activity_id)
+        form.activity_id.choices = [(assigned_activity.id, assigned_activity.name)]
+        form.activity_id.data = assigned_activity.id
+    else:
+        form.activity_id.choices = [(activity.id, activity.name) for activity in Activity.query.all()]
+    
+    if form.validate_on_submit():
+        previous_team_id = score.team_id
+        team_id = form.team_id.data
+        # Enforce activity lock when editing
+        activity_id = (current_user.activity_id if current_user.role != 'admin' and getattr(current_user, 'activity_id', None)
+                       else form.activity_id.data)
+        
+        # Moving onto a key that already has a score updates that score instead.
+        # Scores of deleted judges are distinct under the per-judge index, so never merge them
+        existing = None
+        if score.created_by is not None or not per_judge():
+            existing = find_score(team_id, activity_id, score.created_by)
+        if existing is not None and existing.id != score.id:
+            existing.score = form.score.data
+            existing.notes = form.notes.data
+            db.session.delete(score)
+            message = 'Score merged into the existing score for this team and activity.'
+        else:
+            score.team_id = team_id
+            score.activity_id = activity_id
+            score.score = form.score.data
+            score.notes = form.notes.data
+            message = 'Score updated successfully!'
+        mark_standings_changed([previous_team_id, team_id])
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent submission stored a score for the same key first
+            db.session.rollback()
+            flash('Another score was saved for this team and activity at the same time. Please try again.', 'error')
+            return redirect(url_for('main.edit_score', score_id=score_id))
+        flash(message, 'success')
+        return redirect(url_for('main.scores'))
+    
+    return render_template('edit_score.html', form=form, score=score)
+
+@bp.route('/scores/<int:score_id>/delete')
+@login_required
+@admin_required
+def delete_score(score_id):
+    score = Score.query.get_or_404(score_id)
+    
+    # Users can only delete their own scores, admins can delete any
+    if current_user.role != 'admin' and score.created_by != current_user.id:
+        abort(403)
+    
+    db.session.delete(score)
+    mark_standings_changed([score.team_id])
+    db.session.commit()
+    flash('Score deleted successfully!', 'success')
+    return redirect(url_for('main.scores'))
+
+@bp.route('/admin/reset-scores', methods=['POST'])
+@login_required
+@admin_required
+def reset_scores():
+    """Reset all scores - Admin only"""
+    try:
+        # Delete all scores
+        Score.query.delete()
+        mark_standings_changed(all_teams=True)
+        db.session.commit()
+        flash('All scores have been reset successfully!', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash('Error resetting scores. Please try again.', 'error')
+    
+    return redirect(url_for('main.admin_dashboard'))
+
+@bp.route('/admin/scores/duplicates')
+@login_required
+@admin_required
+def score_duplicates():
+    """Scores that break the configured uniqueness policy"""
+    return render_template('score_duplicates.html',
+                           duplicates=find_duplicates(),
+                           policy=current_app.config['SCORE_UNIQUENESS'],
+                           index_exists=unique_index_exists(),
+                           csrf_token=generate_csrf())
+
+@bp.route('/admin/scores/duplicates/create-index', methods=['POST'])
+@login_required
+@admin_required
+def create_score_index():
+    """Retry creating the uniqueness index once duplicates have been resolved"""
+    if not csrf_token_valid(request.form.get('csrf_token')):
+        flash('Your session expired. Please try again.', 'error')
+    elif ensure_unique_index():
+        flash('Unique score index created.', 'success')
+    else:
+        flash('Duplicates still block the unique index. Resolve the scores listed below first.', 'error')
+    return redirect(url_for('main.score_duplicates'))
+
+@bp.route('/dashboard')
+@login_required
+def dashboard():
+    if current_user.role == 'admin':
+        return redirect(url_for('main.admin_dashboard'))
+    else:
+        return redirect(url_for('main.user_dashboard'))
+
+@bp.route('/api/leaderboard')
+def api_leaderboard():
+    """Leaderboard for display clients.
+
+    Query parameters:
+      top=N          only the N highest-ranked teams
+      fields=a,b     subset of LEADERBOARD_FIELDS
+      since=V        only teams whose standing changed after version V, plus
+                     the ranked ids of all (top N) teams
+      format=json|columnar|msgpack
+    Without since/format=columnar the JSON body is a list of team dicts.
+    """
+    fields = request.args.get('fields')
+    fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else list(DEFAULT_LEADERBOARD_FIELDS)
+    unknown = [f for f in fields if f not in LEADERBOARD_FIELDS]
+    if unknown:
+        return jsonify({'error': f"Unknown fields: {', '.join(unknown)}",
+                        'fields': list(LEADERBOARD_FIELDS)}), 400
+    if not fields:
+        return jsonify({'error': 'fields must name at least one field',
+                        'fields': list(LEADERBOARD_FIELDS)}), 400
+
+    top = request.args.get('top', type=int)
+    since = request.args.get('since', type=int)
+    output = request.args.get('format', 'json')
+    if output not in ('json', 'columnar', 'msgpack'):
+        return jsonify({'error': 'format must be json, columnar or msgpack'}), 400
+
+    session = snapshot.read_session()
+    version = current_version(session)
+    standings = compute_standings(session)
+    if top is not None:
+        standings = standings[:max(top, 0)]
+
+    changed = standings
+    if since is not None:
+        changed = [team for team in standings if team['standings_version'] > since]
+
+    if output == 'columnar':
+        payload = {'version': version,
+                   'columns': {field: [team[field] for team in changed] for field in fields}}
+    else:
+        rows = [{field: team[field] for field in fields} for team in changed]
+        payload = {'version': version, 'teams': rows} if since is not None else rows
+    if since is not None:
+        # Lets clients reorder and drop removed teams without resending them
+        payload['ids'] = [team['id'] for team in standings]
+
+    if output == 'msgpack':
+        try:
+            import msgpack
+        except ImportError:
+            # A missing optional dependency on the server, not a negotiation failure
+            return jsonify({'error': 'MessagePack encoding requires the msgpack package'}), 501
+        response = current_app.response_class(msgpack.packb(payload), mimetype='application/msgpack')
+    else:
+        response = jsonify(payload)
+
+    response.headers['X-Standings-Version'] = str(version)
+    # Built from the validated parameters; the raw query string may hold characters ETags cannot
+    response.set_etag(f"{version}-{top}-{since}-{output}-{','.join(fields)}", weak=True)
+    return response.make_conditional(request)
+
+@bp.route('/admin/users')
+@login_required
+@admin_required
+def admin_users():
+    users = User.query.all()
+    return render_template('admin_users.html', users=users)
+
+@bp.route('/admin/users/<int:user_id>/toggle_role')
+@login_required
+@admin_required
+def toggle_user_role(user_id):
+    user = User.query.get_or_404(user_id)
+    if user.id == current_user.id:
+        flash('You cannot change your own role!', 'error')
+    else:
+        user.role = 'admin' if user.role == 'user' else 'user'
+        db.session.commit()
+        flash(f'User {user.username} role changed to {user.role}', 'success')
+    return redirect(url_for('main.admin_users'))
+
+@bp.route('/admin/users/<int:user_id>/delete')
+@login_required
+@admin_required
+def delete_user(user_id):
+    user = User.query.get_or_404(user_id)
+    if user.id == current_user.id:
+        flash('You cannot delete your own account!', 'error')
+    else:
+        username = user.username
+        try:
+            delete_users([user.id])
+            db.session.commit()
+            flash(f'User {username} deleted successfully', 'success')
+        except IntegrityError:
+            # Databases created before score.created_by became nullable
+            db.session.rollback()
+            flash('Could not delete user: run migrate_db.py to update the score table.', 'error')
+    return redirect(url_for('main.admin_users'))
+
+@bp.route('/download/sample-teams-csv')
+def download_sample_csv():
+    """Download sample CSV template for team bulk upload"""
+    try:
+        csv_content = """Team Name
+Team Alpha
+Team Beta
+Team Gamma
+Team Delta
+Team Echo
+Team Foxtrot
+Team Golf
+Team Hotel"""
+        
+        return csv_content, 200, {
+            'Content-Type': 'text/csv',
+            'Content-Disposition': 'attachment; filename=sample_teams.csv'
+        }
+    except Exception as e:
+        flash('Error generating sample CSV file.', 'error')
+        return redirect(url_for('main.teams'))
@@ -0,0 +1,142 @@
+"""
+Score uniqueness policy for Scoresheet Halubilo
+SCORE_UNIQUENESS decides what identifies a score:
+  'team_activity'        one score per team and activity (the latest entry wins)
+  'team_activity_judge'  one score per team, activity and judge; standings
+                         average the judges' scores for each activity.
+                         Scores left by deleted judges (created_by NULL) are
+                         not constrained, as unique indexes treat NULLs as distinct
+The policy is enforced by a unique index on the score table, and new entries
+update the existing score for their key instead of adding another row.
+"""
+
+from flask import current_app
+from sqlalchemy import func, inspect, text
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import User, Team, Activity, Score
+
+POLICIES = {
+    'team_activity': ('team_id', 'activity_id'),
+    'team_activity_judge': ('team_id', 'activity_id', 'created_by'),
+}
+INDEX_NAMES = {
+    'team_activity': 'uq_score_team_activity',
+    'team_activity_judge': 'uq_score_team_activity_judge',
+}
+
+
+def policy():
+    """Return the configured uniqueness policy name"""
+    return current_app.config['SCORE_UNIQUENESS']
+
+
+def per_judge():
+    """True when each judge keeps their own score for a team and activity"""
+    return policy() == 'team_activity_judge'
+
+
+def score_filter(team_id, activity_id, judge_id):
+    """Return the filter_by() keywords identifying a score under the current policy"""
+    key = {'team_id': team_id, 'activity_id': activity_id}
+    if per_judge():
+        key['created_by'] = judge_id
+    return key
+
+
+def find_score(team_id, activity_id, judge_id):
+    """Return the existing score for this key, or None"""
+    return Score.query.filter_by(**score_filter(team_id, activity_id, judge_id)).first()
+
+
+def upsert_score(team_id, activity_id, value, judge_id, notes=None):
+    """Insert a score or update the one already stored for its key; return (score, created)"""
+    score = find_score(team_id, activity_id, judge_id)
+    if score is None:
+        score = Score(team_id=team_id, activity_id=activity_id, score=value,
+                      notes=notes, created_by=judge_id)
+        db.session.add(score)
+        return score, True
+
+    score.score = value
+    if notes is not None:
+        score.notes = notes
+    score.created_by = judge_id
+    return score, False
+
+
+def find_duplicates(session=None):
+    """Return groups of scores that break the current policy, largest first"""
+    session = session or db.session
+    key_columns = [getattr(Score, name) for name in POLICIES[policy()]]
+    groups = (session.query(*key_columns,
+                            func.count(Score.id).label('count'),
+                            func.min(Score.score).label('min_score'),
+                            func.max(Score.score).label('max_score'))
+              .filter(*([Score.created_by.isnot(None)] if per_judge() else []))
+              .group_by(*key_columns)
+              .having(func.count(Score.id) > 1)
+              .subquery())
+
+    query = (session.query(Team.name.label('team'), Activity.name.label('activity'),
+                           groups.c.count, groups.c.min_score, groups.c.max_score,
+                           groups.c.team_id, groups.c.activity_id)
+             .join(groups, groups.c.team_id == Team.id)
+             .join(Activity, Activity.id == groups.c.activity_id))
+    if per_judge():
+        query = query.add_columns(User.username.label('judge')).outerjoin(User, User.id == groups.c.created_by)
+
+    duplicates = []
+    # Read by name: the per-judge policy adds a key column to the group subquery
+    for row in query.order_by(groups.c.count.desc()).all():
+        row = row._mapping
+        duplicates.append({
+            'team': row['team'],
+            'activity': row['activity'],
+            'count': row['count'],
+            'min_score': row['min_score'],
+            'max_score': row['max_score'],
+            'team_id': row['team_id'],
+            'activity_id': row['activity_id'],
+            'judge': row['judge'] if per_judge() else None,
+        })
+    return duplicates
+
+
+def unique_index_exists(app=None):
+    """True when the unique index for the configured policy is in place"""
+    app = app or current_app
+    name = INDEX_NAMES[app.config['SCORE_UNIQUENESS']]
+    return any(index['name'] == name for index in inspect(db.engine).get_indexes('score'))
+
+
+def ensure_unique_index(app=None):
+    """Create the unique index for the configured policy, then drop the other one"""
+    app = app or current_app
+    name = INDEX_NAMES[app.config['SCORE_UNIQUENESS']]
+    columns = ', '.join(POLICIES[app.config['SCORE_UNIQUENESS']])
+    try:
+        db.session.execute(text(f'CREATE UNIQUE INDEX IF NOT EXISTS {name} ON score ({columns})'))
+        db.session.commit()
+    except IntegrityError:
+        # Keep the previous policy's index so the table is never left unconstrained;
+        # duplicates must be resolved first (see /admin/scores/duplicates)
+        db.session.rollback()
+        app.logger.warning('Could not create unique index %s: the score table has duplicates '
+                           'for policy %s', name, app.config['SCORE_UNIQUENESS'])
+        return False
+
+    for other in INDEX_NAMES.values():
+        if other != name:
+            db.session.execute(text(f'DROP INDEX IF EXISTS {other}'))
+    db.session.commit()
+    return True
+
+
+def init_app(app):
+    """Validate the configured uniqueness policy"""
+    app.config.setdefault('SCORE_UNIQUENESS', 'team_activity_judge')
+    if app.config['SCORE_UNIQUENESS'] not in POLICIES:
+        raise ValueError(f"SCORE_UNIQUENESS must be one of {', '.join(POLICIES)}, "
+                         f"not {app.config['SCORE_UNIQUENESS']!r}")
@@ -0,0 +1,114 @@
+"""
+Read-only snapshot of the SQLite database for public read traffic
+Public leaderboard endpoints read from a copy of scoresheet.db made with the
+SQLite backup API and refreshed at most every READ_SNAPSHOT_MAX_STALENESS
+seconds, so spectator traffic never contends with judges' writes.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from flask import current_app, g
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from extensions import db
+
+_refresh_lock = threading.Lock()
+
+
+def _source_path():
+    """Return the path of the main SQLite database, or None if it is not a file-backed SQLite DB"""
+    url = db.engine.url
+    if url.get_backend_name() != 'sqlite' or not url.database or url.database == ':memory:':
+        return None
+    return url.database
+
+
+def refresh(app=None):
+    """Copy the live database to the snapshot file and atomically swap it in"""
+    app = app or current_app
+    source = _source_path()
+    if source is None:
+        return False
+
+    target = app.config['READ_SNAPSHOT_PATH']
+    tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(tmp)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+    # Readers with the old file open keep using it until their session ends
+    os.replace(tmp, target)
+    return True
+
+
+def _ensure_fresh(app):
+    """Refresh the snapshot if it is missing or older than the staleness bound"""
+    path = app.config['READ_SNAPSHOT_PATH']
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        age = None
+
+    if age is not None and age <= app.config['READ_SNAPSHOT_MAX_STALENESS']:
+        return
+
+    # Only one thread refreshes; others keep reading the current snapshot
+    blocking = age is None
+    if _refresh_lock.acquire(blocking=blocking):
+        try:
+            refresh(app)
+        finally:
+            _refresh_lock.release()
+
+
+def invalidate(app=None):
+    """Mark the snapshot stale so the next public read refreshes it"""
+    app = app or current_app
+    path = app.config.get('READ_SNAPSHOT_PATH')
+    if path and os.path.exists(path):
+        stale = time.time() - app.config['READ_SNAPSHOT_MAX_STALENESS'] - 1
+        os.utime(path, (stale, stale))
+
+
+def read_session():
+    """Return a session for public reads: the snapshot when enabled, otherwise db.session"""
+    app = current_app._get_current_object()
+    state = app.extensions.get('read_snapshot')
+    if state is None or _source_path() is None:
+        return db.session
+
+    if 'read_snapshot_session' not in g:
+        _ensure_fresh(app)
+        g.read_snapshot_session = state['sessionmaker']()
+    return g.read_snapshot_session
+
+
+def _close_session(exc):
+    session = g.pop('read_snapshot_session', None)
+    if session is not None:
+        session.close()
+
+
+def init_app(app):
+    """Enable snapshot reads when READ_SNAPSHOT_ENABLED is set"""
+    app.config.setdefault('READ_SNAPSHOT_ENABLED', False)
+    app.config.setdefault('READ_SNAPSHOT_MAX_STALENESS', 5.0)
+    if not app.config.get('READ_SNAPSHOT_PATH'):
+        app.config['READ_SNAPSHOT_PATH'] = os.path.join(app.instance_path, 'scoresheet-snapshot.db')
+    if not app.config['READ_SNAPSHOT_ENABLED']:
+        return
+
+    os.makedirs(os.path.dirname(app.config['READ_SNAPSHOT_PATH']), exist_ok=True)
+    # NullPool: every session opens the current snapshot file, never a replaced one
+    engine = create_engine(f"sqlite:///file:{app.config['READ_SNAPSHOT_PATH']}?mode=ro&uri=true",
+                           poolclass=NullPool)
+    app.extensions['read_snapshot'] = {'engine': engine, 'sessionmaker': sessionmaker(bind=engine)}
+    app.teardown_appcontext(_close_session)
@@ -0,0 +1,111 @@
+"""
+Team standings for Scoresheet Halubilo
+Totals are computed with a single aggregate query instead of loading every
+team's scores through the ORM.
+"""
+
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+
+from extensions import db
+from models import Team, Activity, Score, StandingsVersion
+
+# Fields a leaderboard client may select, and those returned by default
+LEADERBOARD_FIELDS = ('id', 'rank', 'name', 'image_filename', 'total_score', 'activities_completed')
+DEFAULT_LEADERBOARD_FIELDS = ('id', 'name', 'image_filename', 'total_score', 'activities_completed')
+
+
+def _number(value):
+    """Round an aggregate to 2 places, keeping whole numbers as int"""
+    value = round(float(value or 0), 2)
+    return int(value) if value.is_integer() else value
+
+
+def compute_standings(session=None):
+    """Return per-team standings as dicts, sorted by total score (descending)
+
+    A team's score for an activity is the average of its scores for that
+    activity, so judges' scores are averaged under the per-judge uniqueness
+    policy (and a single score is used as-is otherwise).
+    """
+    session = session or db.session
+    per_activity = (session.query(Score.team_id,
+                                  Score.activity_id,
+                                  func.avg(Score.score).label('score'))
+                    .group_by(Score.team_id, Score.activity_id)
+                    .subquery())
+    rows = (session.query(Team.id,
+                          Team.name,
+                          Team.image_filename,
+                          Team.standings_version,
+                          Team.standings_rank,
+                          func.coalesce(func.sum(per_activity.c.score), 0),
+                          func.count(per_activity.c.activity_id),
+                          func.max(per_activity.c.score))
+            .outerjoin(per_activity, per_activity.c.team_id == Team.id)
+            .group_by(Team.id)
+            .all())
+
+    standings = [{
+        'id': team_id,
+        'name': name,
+        'image_filename': image_filename,
+        'total_score': _number(total_score),
+        'activities_completed': activities_completed,
+        'average_score': total_score / activities_completed if activities_completed else 0,
+        'highest_score': _number(highest_score),
+        'standings_version': standings_version,
+        'standings_rank': standings_rank
+    } for (team_id, name, image_filename, standings_version, standings_rank,
+           total_score, activities_completed, highest_score) in rows]
+
+    # Sort by total score (descending); ties by id so ranks are stable between queries
+    standings.sort(key=lambda x: (-x['total_score'], x['id']))
+    for rank, team in enumerate(standings, start=1):
+        team['rank'] = rank
+    return standings
+
+
+def leaderboard_context(session=None):
+    """Return the template context for the public leaderboard (index.html)"""
+    session = session or db.session
+    recent_scores = (session.query(Score)
+                     .options(joinedload(Score.team), joinedload(Score.activity))
+                     .order_by(Score.created_at.desc())
+                     .limit(5)
+                     .all())
+    return {
+        'teams': compute_standings(session),
+        'activity_count': session.query(Activity).count(),
+        'score_count': session.query(Score).count(),
+        'recent_scores': recent_scores,
+    }
+
+
+def current_version(session=None):
+    """Return the current standings version (0 before any change)"""
+    session = session or db.session
+    return session.query(StandingsVersion.version).filter_by(id=1).scalar() or 0
+
+
+def mark_changed(team_ids=(), all_teams=False):
+    """Bump the standings version and stamp it on the given teams; call before commit"""
+    # Lets after-commit listeners (e.g. the static publisher) react to the change
+    db.session.info['standings_changed'] = True
+    updated = (StandingsVersion.query.filter_by(id=1)
+               .update({StandingsVersion.version: StandingsVersion.version + 1},
+                       synchronize_session=False))
+    if not updated:
+        db.session.add(StandingsVersion(id=1, version=1))
+        db.session.flush()
+    version = current_version()
+
+    # Teams whose rank moved count as changed too, so a client asking for
+    # top=N&since=V gets a full row for every team that entered its top N
+    team_ids = set(team_ids)
+    updates = [{'id': team['id'], 'standings_version': version, 'standings_rank': team['rank']}
+               for team in compute_standings()
+               if all_teams or team['id'] in team_ids or team['rank'] != team['standings_rank']]
+    if updates:
+        db.session.bulk_update_mappings(Team, updates)
+    return version
@@ -10,7 +10,9 @@ path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if path not in sys.path:
     sys.path.append(path)
 
-from app import app
+from app import create_app
+
+app = application = create_app()
 
 if __name__ == "__main__":
     app.run()